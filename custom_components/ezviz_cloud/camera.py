@@ -1,13 +1,14 @@
 """Support ezviz camera devices."""
 from __future__ import annotations
 
+import asyncio
 import logging
+from typing import Any
 
 import voluptuous as vol
 
 from homeassistant.components import ffmpeg
 from homeassistant.components.camera import Camera, CameraEntityFeature
-from homeassistant.components.ffmpeg import get_ffmpeg_manager
 from homeassistant.components.stream import CONF_USE_WALLCLOCK_AS_TIMESTAMPS
 from homeassistant.config_entries import (
     SOURCE_IGNORE,
@@ -15,7 +16,7 @@ from homeassistant.config_entries import (
     ConfigEntry,
 )
 from homeassistant.const import CONF_IP_ADDRESS, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import (
     config_validation as cv,
     discovery_flow,
@@ -34,6 +35,7 @@ from .const import (
     DATA_COORDINATOR,
     DEFAULT_CAMERA_USERNAME,
     DEFAULT_FFMPEG_ARGUMENTS,
+    DEFAULT_RTSP_PORT,
     DIR_DOWN,
     DIR_LEFT,
     DIR_RIGHT,
@@ -50,6 +52,32 @@ from .entity import EzvizEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds a snapshot grabbed through ffmpeg is reused for further image requests.
+SNAPSHOT_TTL = 2.0
+
+# Service direction values mapped to the direction names expected by the API.
+PTZ_DIRECTIONS = {DIR_UP: "UP", DIR_DOWN: "DOWN", DIR_LEFT: "LEFT", DIR_RIGHT: "RIGHT"}
+
+PTZ_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Required(ATTR_DIRECTION): vol.In(list(PTZ_DIRECTIONS)),
+        vol.Required(ATTR_SPEED): cv.positive_int,
+    }
+)
+ALARM_TRIGGER_SCHEMA = cv.make_entity_service_schema(
+    {vol.Required(ATTR_ENABLE): cv.positive_int}
+)
+WAKE_DEVICE_SCHEMA = cv.make_entity_service_schema({})
+ALARM_SOUND_SCHEMA = cv.make_entity_service_schema(
+    {vol.Required(ATTR_LEVEL): cv.positive_int}
+)
+DETECTION_SENSITIVITY_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Required(ATTR_LEVEL): cv.positive_int,
+        vol.Required(ATTR_TYPE): cv.positive_int,
+    }
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -62,114 +90,107 @@ async def async_setup_entry(
         DATA_COORDINATOR
     ]
 
-    camera_entities = []
-
-    cameras_ignored: list[str | None] = [
-        item.unique_id
-        for item in hass.config_entries.async_entries(DOMAIN)
-        if item.source == SOURCE_IGNORE
-    ]
-
-    for camera, value in coordinator.data.items():
-
-        camera_rtsp_entry = [
-            item
-            for item in hass.config_entries.async_entries(DOMAIN)
-            if item.unique_id == camera and item.source != SOURCE_IGNORE
-        ]
-
-        if camera_rtsp_entry:
-
-            ffmpeg_arguments = camera_rtsp_entry[0].options[CONF_FFMPEG_ARGUMENTS]
-            camera_username = camera_rtsp_entry[0].data[CONF_USERNAME]
-            camera_password = camera_rtsp_entry[0].data[CONF_PASSWORD]
-
-            camera_rtsp_stream = f"rtsp://{camera_username}:{camera_password}@{value['local_ip']}:{value['local_rtsp_port']}{ffmpeg_arguments}"
-            _LOGGER.debug(
-                "Configuring Camera %s with ip: %s rtsp port: %s ffmpeg arguments: %s",
-                camera,
-                value["local_ip"],
-                value["local_rtsp_port"],
-                ffmpeg_arguments,
-            )
+    cameras_ignored: set[str | None] = set()
+    rtsp_entries: dict[str | None, ConfigEntry] = {}
 
+    for item in hass.config_entries.async_entries(DOMAIN):
+        if item.source == SOURCE_IGNORE:
+            cameras_ignored.add(item.unique_id)
         else:
-
-            discovery_flow.async_create_flow(
-                hass,
-                DOMAIN,
-                context={"source": SOURCE_INTEGRATION_DISCOVERY},
-                data={
-                    ATTR_SERIAL: camera,
-                    CONF_IP_ADDRESS: value["local_ip"],
-                },
-            )
-
-            if camera not in cameras_ignored:
-
-                _LOGGER.warning(
-                    "Found camera with serial %s without configuration. Please go to integration to complete setup",
-                    camera,
-                )
-
-            ffmpeg_arguments = DEFAULT_FFMPEG_ARGUMENTS
-            camera_username = DEFAULT_CAMERA_USERNAME
-            camera_password = None
-            camera_rtsp_stream = ""
-
-        camera_entities.append(
-            EzvizCamera(
-                hass,
-                coordinator,
-                camera,
-                camera_username,
-                camera_password,
-                camera_rtsp_stream,
-                value["local_rtsp_port"],
-                ffmpeg_arguments,
-            )
+            rtsp_entries[item.unique_id] = item
+
+    camera_entities = [
+        EzvizCamera(
+            coordinator,
+            camera,
+            *_async_resolve_camera_config(
+                hass, camera, value, rtsp_entries, cameras_ignored
+            ),
         )
+        for camera, value in coordinator.data.items()
+    ]
 
     async_add_entities(camera_entities)
 
     platform = entity_platform.async_get_current_platform()
 
-    platform.async_register_entity_service(
-        SERVICE_PTZ,
-        {
-            vol.Required(ATTR_DIRECTION): vol.In(
-                [DIR_UP, DIR_DOWN, DIR_LEFT, DIR_RIGHT]
-            ),
-            vol.Required(ATTR_SPEED): cv.positive_int,
-        },
-        "perform_ptz",
-    )
+    platform.async_register_entity_service(SERVICE_PTZ, PTZ_SCHEMA, "async_perform_ptz")
 
     platform.async_register_entity_service(
-        SERVICE_ALARM_TRIGGER,
-        {
-            vol.Required(ATTR_ENABLE): cv.positive_int,
-        },
-        "perform_sound_alarm",
+        SERVICE_ALARM_TRIGGER, ALARM_TRIGGER_SCHEMA, "async_perform_sound_alarm"
     )
 
     platform.async_register_entity_service(
-        SERVICE_WAKE_DEVICE, {}, "perform_wake_device"
+        SERVICE_WAKE_DEVICE, WAKE_DEVICE_SCHEMA, "async_perform_wake_device"
     )
 
     platform.async_register_entity_service(
-        SERVICE_ALARM_SOUND,
-        {vol.Required(ATTR_LEVEL): cv.positive_int},
-        "perform_alarm_sound",
+        SERVICE_ALARM_SOUND, ALARM_SOUND_SCHEMA, "async_perform_alarm_sound"
     )
 
     platform.async_register_entity_service(
         SERVICE_DETECTION_SENSITIVITY,
-        {
-            vol.Required(ATTR_LEVEL): cv.positive_int,
-            vol.Required(ATTR_TYPE): cv.positive_int,
-        },
-        "perform_set_alarm_detection_sensibility",
+        DETECTION_SENSITIVITY_SCHEMA,
+        "async_perform_set_alarm_detection_sensibility",
+    )
+
+
+@callback
+def _async_resolve_camera_config(
+    hass: HomeAssistant,
+    camera: str,
+    value: dict[str, Any],
+    rtsp_entries: dict[str | None, ConfigEntry],
+    cameras_ignored: set[str | None],
+) -> tuple[str, str | None, int, str]:
+    """Return the RTSP configuration for a camera, starting discovery if missing."""
+
+    camera_rtsp_entry = rtsp_entries.get(camera)
+    local_ip = value["local_ip"]
+    local_rtsp_port = value["local_rtsp_port"] or DEFAULT_RTSP_PORT
+
+    if camera_rtsp_entry is not None:
+
+        ffmpeg_arguments = camera_rtsp_entry.options[CONF_FFMPEG_ARGUMENTS]
+        camera_username = camera_rtsp_entry.data[CONF_USERNAME]
+        camera_password = camera_rtsp_entry.data[CONF_PASSWORD]
+
+        _LOGGER.debug(
+            "Configuring Camera %s with ip: %s rtsp port: %s ffmpeg arguments: %s",
+            camera,
+            local_ip,
+            local_rtsp_port,
+            ffmpeg_arguments,
+        )
+
+    else:
+
+        discovery_flow.async_create_flow(
+            hass,
+            DOMAIN,
+            context={"source": SOURCE_INTEGRATION_DISCOVERY},
+            data={
+                ATTR_SERIAL: camera,
+                CONF_IP_ADDRESS: local_ip,
+            },
+        )
+
+        if camera not in cameras_ignored:
+
+            _LOGGER.warning(
+                "Found camera with serial %s without configuration. Please go to integration to complete setup",
+                camera,
+            )
+
+        ffmpeg_arguments = DEFAULT_FFMPEG_ARGUMENTS
+        camera_username = DEFAULT_CAMERA_USERNAME
+        camera_password = None
+
+    return (
+        camera_username,
+        camera_password,
+        local_rtsp_port,
+        ffmpeg_arguments,
     )
 
 
@@ -178,12 +199,10 @@ class EzvizCamera(EzvizEntity, Camera):
 
     def __init__(
         self,
-        hass: HomeAssistant,
         coordinator: EzvizDataUpdateCoordinator,
         serial: str,
         camera_username: str,
         camera_password: str | None,
-        camera_rtsp_stream: str | None,
         local_rtsp_port: int,
         ffmpeg_arguments: str | None,
     ) -> None:
@@ -193,10 +212,21 @@ class EzvizCamera(EzvizEntity, Camera):
         self.stream_options[CONF_USE_WALLCLOCK_AS_TIMESTAMPS] = True
         self._username = camera_username
         self._password = camera_password
-        self._rtsp_stream = camera_rtsp_stream
         self._local_rtsp_port = local_rtsp_port
         self._ffmpeg_arguments = ffmpeg_arguments
-        self._ffmpeg = get_ffmpeg_manager(hass)
+        self._rtsp_prefix = f"rtsp://{camera_username}:{camera_password}@"
+        self._rtsp_suffix = f":{local_rtsp_port}{ffmpeg_arguments}"
+        self._rtsp_stream = (
+            ""
+            if camera_password is None
+            else self._rtsp_prefix + self.data["local_ip"] + self._rtsp_suffix
+        )
+        self._snapshot_cache: dict[
+            tuple[int | None, int | None], tuple[float, bytes | None]
+        ] = {}
+        self._snapshot_requests: dict[
+            tuple[int | None, int | None], asyncio.Task[bytes | None]
+        ] = {}
         self._attr_unique_id = serial
         self._attr_name = self.data["name"]
         if camera_password:
@@ -222,18 +252,22 @@ class EzvizCamera(EzvizEntity, Camera):
         """Camera Motion Detection Status."""
         return self.data["alarm_notify"]
 
-    def enable_motion_detection(self) -> None:
+    async def async_enable_motion_detection(self) -> None:
         """Enable motion detection in camera."""
         try:
-            self.coordinator.ezviz_client.set_camera_defence(self._serial, 1)
+            await self.hass.async_add_executor_job(
+                self.coordinator.ezviz_client.set_camera_defence, self._serial, 1
+            )
 
         except InvalidHost as err:
             raise InvalidHost("Error enabling motion detection") from err
 
-    def disable_motion_detection(self) -> None:
+    async def async_disable_motion_detection(self) -> None:
         """Disable motion detection."""
         try:
-            self.coordinator.ezviz_client.set_camera_defence(self._serial, 0)
+            await self.hass.async_add_executor_job(
+                self.coordinator.ezviz_client.set_camera_defence, self._serial, 0
+            )
 
         except InvalidHost as err:
             raise InvalidHost("Error disabling motion detection") from err
@@ -242,74 +276,120 @@ class EzvizCamera(EzvizEntity, Camera):
         self, width: int | None = None, height: int | None = None
     ) -> bytes | None:
         """Return a frame from the camera stream."""
-        if self._rtsp_stream is None:
+        if not self._rtsp_stream:
             return None
-        return await ffmpeg.async_get_image(
-            self.hass, self._rtsp_stream, width=width, height=height
-        )
+
+        size = (width, height)
+
+        cached = self._snapshot_cache.get(size)
+        if cached is not None and self.hass.loop.time() - cached[0] < SNAPSHOT_TTL:
+            return cached[1]
+
+        # Concurrent requests for the same size share a single ffmpeg run.
+        if (request := self._snapshot_requests.get(size)) is None:
+            request = self._snapshot_requests[size] = self.hass.async_create_task(
+                self._async_fetch_snapshot(width, height)
+            )
+        return await asyncio.shield(request)
+
+    async def _async_fetch_snapshot(
+        self, width: int | None, height: int | None
+    ) -> bytes | None:
+        """Grab a frame with ffmpeg and cache it, including failed grabs."""
+        size = (width, height)
+        try:
+            image = await ffmpeg.async_get_image(
+                self.hass, self._rtsp_stream, width=width, height=height
+            )
+        finally:
+            del self._snapshot_requests[size]
+
+        now = self.hass.loop.time()
+        # Drop expired frames so sizes no longer requested don't pin memory.
+        self._snapshot_cache = {
+            key: cached
+            for key, cached in self._snapshot_cache.items()
+            if now - cached[0] < SNAPSHOT_TTL
+        }
+        self._snapshot_cache[size] = (now, image)
+        return image
 
     async def stream_source(self) -> str | None:
         """Return the stream source."""
         if self._password is None:
             return None
         local_ip = self.data["local_ip"]
-        self._rtsp_stream = (
-            f"rtsp://{self._username}:{self._password}@"
-            f"{local_ip}:{self._local_rtsp_port}{self._ffmpeg_arguments}"
-        )
-        _LOGGER.debug(
-            "Configuring Camera %s with ip: %s rtsp port: %s ffmpeg arguments: %s",
-            self._serial,
-            local_ip,
-            self._local_rtsp_port,
-            self._ffmpeg_arguments,
-        )
+        self._rtsp_stream = self._rtsp_prefix + local_ip + self._rtsp_suffix
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Configuring Camera %s with ip: %s rtsp port: %s ffmpeg arguments: %s",
+                self._serial,
+                local_ip,
+                self._local_rtsp_port,
+                self._ffmpeg_arguments,
+            )
 
         return self._rtsp_stream
 
-    def perform_ptz(self, direction: str, speed: int) -> None:
+    def _ptz_pulse(self, api_direction: str, speed: int) -> None:
+        """Start and immediately stop a PTZ movement."""
+        self.coordinator.ezviz_client.ptz_control(
+            api_direction, self._serial, "START", speed
+        )
+        self.coordinator.ezviz_client.ptz_control(
+            api_direction, self._serial, "STOP", speed
+        )
+
+    async def async_perform_ptz(self, direction: str, speed: int) -> None:
         """Perform a PTZ action on the camera."""
+        api_direction = PTZ_DIRECTIONS[direction]
         try:
-            self.coordinator.ezviz_client.ptz_control(
-                str(direction).upper(), self._serial, "START", speed
-            )
-            self.coordinator.ezviz_client.ptz_control(
-                str(direction).upper(), self._serial, "STOP", speed
+            await self.hass.async_add_executor_job(
+                self._ptz_pulse, api_direction, speed
             )
 
         except HTTPError as err:
             raise HTTPError("Cannot perform PTZ") from err
 
-    def perform_sound_alarm(self, enable: int) -> None:
+    async def async_perform_sound_alarm(self, enable: int) -> None:
         """Sound the alarm on a camera."""
         try:
-            self.coordinator.ezviz_client.sound_alarm(self._serial, enable)
+            await self.hass.async_add_executor_job(
+                self.coordinator.ezviz_client.sound_alarm, self._serial, enable
+            )
         except HTTPError as err:
             raise HTTPError("Cannot sound alarm") from err
 
-    def perform_wake_device(self) -> None:
+    async def async_perform_wake_device(self) -> None:
         """Basically wakes the camera by querying the device."""
         try:
-            self.coordinator.ezviz_client.get_detection_sensibility(self._serial)
+            await self.hass.async_add_executor_job(
+                self.coordinator.ezviz_client.get_detection_sensibility, self._serial
+            )
         except (HTTPError, PyEzvizError) as err:
             raise PyEzvizError("Cannot wake device") from err
 
-    def perform_alarm_sound(self, level: int) -> None:
+    async def async_perform_alarm_sound(self, level: int) -> None:
         """Enable/Disable movement sound alarm."""
         try:
-            self.coordinator.ezviz_client.alarm_sound(self._serial, level, 1)
+            await self.hass.async_add_executor_job(
+                self.coordinator.ezviz_client.alarm_sound, self._serial, level, 1
+            )
         except HTTPError as err:
             raise HTTPError(
                 "Cannot set alarm sound level for on movement detected"
             ) from err
 
-    def perform_set_alarm_detection_sensibility(
+    async def async_perform_set_alarm_detection_sensibility(
         self, level: int, type_value: int
     ) -> None:
         """Set camera detection sensibility level service."""
         try:
-            self.coordinator.ezviz_client.detection_sensibility(
-                self._serial, level, type_value
+            await self.hass.async_add_executor_job(
+                self.coordinator.ezviz_client.detection_sensibility,
+                self._serial,
+                level,
+                type_value,
             )
         except (HTTPError, PyEzvizError) as err:
             raise PyEzvizError("Cannot set detection sensitivity level") from err
@@ -1,10 +1,13 @@
 """Provides the ezviz DataUpdateCoordinator."""
+import asyncio
+from copy import deepcopy
 from datetime import timedelta
 import logging
+from typing import Any
 
 from async_timeout import timeout
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from pyezviz.client import EzvizClient
@@ -20,6 +23,9 @@ from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+UPDATE_INTERVAL = timedelta(seconds=30)
+MAX_UPDATE_INTERVAL = timedelta(minutes=5)
+
 
 class EzvizDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Ezviz data."""
@@ -30,15 +36,30 @@ class EzvizDataUpdateCoordinator(DataUpdateCoordinator):
         """Initialize global Ezviz data updater."""
         self.ezviz_client = api
         self._api_timeout = api_timeout
-        update_interval = timedelta(seconds=30)
+        self._last_notified: tuple[bool, Any] | None = None
+
+        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=UPDATE_INTERVAL)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners only if the data or update status changed."""
+        if (self.last_update_success, self.data) == self._last_notified:
+            return
+        # pyezviz mutates and returns the same dict on every poll, so compare
+        # against a snapshot rather than a reference to it.
+        self._last_notified = (self.last_update_success, deepcopy(self.data))
+        super().async_update_listeners()
 
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=update_interval)
+    @callback
+    def _async_backoff(self) -> None:
+        """Double the poll interval after each consecutive failed update."""
+        self.update_interval = min(self.update_interval * 2, MAX_UPDATE_INTERVAL)
 
     async def _async_update_data(self) -> dict:
         """Fetch data from Ezviz."""
         try:
             async with timeout(self._api_timeout):
-                return await self.hass.async_add_executor_job(
+                data = await self.hass.async_add_executor_job(
                     self.ezviz_client.load_cameras
                 )
 
@@ -46,4 +67,13 @@ class EzvizDataUpdateCoordinator(DataUpdateCoordinator):
             raise ConfigEntryAuthFailed from error
 
         except (InvalidURL, HTTPError, PyEzvizError) as error:
+            self._async_backoff()
             raise UpdateFailed(f"Invalid response from API: {error}") from error
+
+        except asyncio.TimeoutError:
+            self._async_backoff()
+            raise
+
+        self.update_interval = UPDATE_INTERVAL
+
+        return data
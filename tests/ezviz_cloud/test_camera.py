@@ -0,0 +1,118 @@
+"""Test the Ezviz camera snapshot cache."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.components.ezviz.camera import EzvizCamera
+from homeassistant.core import HomeAssistant
+
+SERIAL = "C666666"
+
+CAMERA_DATA = {
+    "name": "Front door",
+    "mac_address": "aa:bb:cc:dd:ee:ff",
+    "device_sub_category": "C6N",
+    "version": "5.3.0",
+    "local_ip": "127.0.0.1",
+    "local_rtsp_port": 554,
+    "status": 1,
+    "alarm_notify": False,
+}
+
+
+def _create_camera(hass: HomeAssistant) -> EzvizCamera:
+    """Create a configured camera entity on a mocked coordinator."""
+    coordinator = MagicMock()
+    coordinator.data = {SERIAL: CAMERA_DATA}
+    camera = EzvizCamera(coordinator, SERIAL, "admin", "test-password", 554, "")
+    camera.hass = hass
+    return camera
+
+
+async def test_camera_image_cached_within_ttl(hass: HomeAssistant) -> None:
+    """Test a snapshot is reused until the TTL expires."""
+    camera = _create_camera(hass)
+
+    with patch(
+        "homeassistant.components.ffmpeg.async_get_image",
+        AsyncMock(return_value=b"image"),
+    ) as mock_get_image:
+        assert await camera.async_camera_image() == b"image"
+        assert await camera.async_camera_image() == b"image"
+        assert mock_get_image.call_count == 1
+
+        with patch("homeassistant.components.ezviz.camera.SNAPSHOT_TTL", 0):
+            assert await camera.async_camera_image() == b"image"
+        assert mock_get_image.call_count == 2
+
+
+async def test_camera_image_cached_per_size(hass: HomeAssistant) -> None:
+    """Test snapshots are cached separately for each requested size."""
+    camera = _create_camera(hass)
+
+    with patch(
+        "homeassistant.components.ffmpeg.async_get_image",
+        AsyncMock(side_effect=lambda *args, **kwargs: kwargs["width"]),
+    ) as mock_get_image:
+        assert await camera.async_camera_image() is None
+        assert await camera.async_camera_image(width=640, height=360) == 640
+        assert await camera.async_camera_image(width=640, height=360) == 640
+        assert await camera.async_camera_image() is None
+        assert mock_get_image.call_count == 2
+
+
+async def test_camera_image_failure_cached(hass: HomeAssistant) -> None:
+    """Test a failed grab is cached so an unreachable camera isn't retried."""
+    camera = _create_camera(hass)
+
+    with patch(
+        "homeassistant.components.ffmpeg.async_get_image",
+        AsyncMock(return_value=None),
+    ) as mock_get_image:
+        assert await camera.async_camera_image() is None
+        assert await camera.async_camera_image() is None
+        assert mock_get_image.call_count == 1
+
+
+async def test_camera_image_without_credentials(hass: HomeAssistant) -> None:
+    """Test an unconfigured camera returns no image without running ffmpeg."""
+    coordinator = MagicMock()
+    coordinator.data = {SERIAL: CAMERA_DATA}
+    camera = EzvizCamera(coordinator, SERIAL, "admin", None, 554, "")
+    camera.hass = hass
+
+    with patch(
+        "homeassistant.components.ffmpeg.async_get_image",
+        AsyncMock(return_value=b"image"),
+    ) as mock_get_image:
+        assert await camera.async_camera_image() is None
+        assert mock_get_image.call_count == 0
+
+
+async def test_camera_image_concurrent_requests(hass: HomeAssistant) -> None:
+    """Test concurrent requests share one ffmpeg run per size, sizes in parallel."""
+    camera = _create_camera(hass)
+    started = asyncio.Event()
+    release = asyncio.Event()
+    runs = []
+
+    async def _get_image(*args, **kwargs):
+        runs.append(kwargs["width"])
+        if len(runs) == 2:
+            started.set()
+        await release.wait()
+        return b"image"
+
+    with patch(
+        "homeassistant.components.ffmpeg.async_get_image",
+        AsyncMock(side_effect=_get_image),
+    ) as mock_get_image:
+        requests = asyncio.gather(
+            *(camera.async_camera_image() for _ in range(3)),
+            camera.async_camera_image(width=640, height=360),
+        )
+        await started.wait()
+        assert sorted(runs, key=str) == [640, None]
+
+        release.set()
+        assert await requests == [b"image"] * 4
+        assert mock_get_image.call_count == 2
@@ -0,0 +1,103 @@
+"""Test the Ezviz data update coordinator."""
+import asyncio
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from pyezviz.exceptions import EzvizAuthTokenExpired, PyEzvizError
+
+from homeassistant.components.ezviz.coordinator import (
+    UPDATE_INTERVAL,
+    EzvizDataUpdateCoordinator,
+)
+from homeassistant.core import HomeAssistant
+
+CAMERA_DATA = {"C666666": {"name": "Front door", "status": 1}}
+
+
+def _create_coordinator(hass: HomeAssistant) -> EzvizDataUpdateCoordinator:
+    """Create a coordinator on a mocked Ezviz client."""
+    return EzvizDataUpdateCoordinator(hass, api=MagicMock(), api_timeout=5)
+
+
+async def test_unchanged_data_does_not_update_listeners(hass: HomeAssistant) -> None:
+    """Test listeners are only updated when the data or update status changes."""
+    coordinator = _create_coordinator(hass)
+    # Like pyezviz, mutate and return the same dict on every poll.
+    cameras = {serial: dict(data) for serial, data in CAMERA_DATA.items()}
+    coordinator.ezviz_client.load_cameras.return_value = cameras
+    listener = MagicMock()
+    unsub = coordinator.async_add_listener(listener)
+
+    await coordinator.async_refresh()
+    assert listener.call_count == 1
+
+    await coordinator.async_refresh()
+    assert listener.call_count == 1
+
+    cameras["C666666"]["status"] = 2
+    await coordinator.async_refresh()
+    assert coordinator.data["C666666"]["status"] == 2
+    assert listener.call_count == 2
+
+    await coordinator.async_refresh()
+    assert listener.call_count == 2
+
+    unsub()
+
+
+async def test_update_status_changes_update_listeners(hass: HomeAssistant) -> None:
+    """Test success, failure and recovery each update listeners."""
+    coordinator = _create_coordinator(hass)
+    coordinator.ezviz_client.load_cameras.side_effect = [
+        dict(CAMERA_DATA),
+        PyEzvizError("error"),
+        dict(CAMERA_DATA),
+    ]
+    listener = MagicMock()
+    unsub = coordinator.async_add_listener(listener)
+
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert listener.call_count == 1
+
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert listener.call_count == 2
+
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert listener.call_count == 3
+
+    unsub()
+
+
+async def test_failed_updates_back_off(hass: HomeAssistant) -> None:
+    """Test the poll interval doubles on failures up to the maximum."""
+    coordinator = _create_coordinator(hass)
+    coordinator.ezviz_client.load_cameras.side_effect = [
+        PyEzvizError("error"),
+        asyncio.TimeoutError,
+        PyEzvizError("error"),
+        asyncio.TimeoutError,
+        PyEzvizError("error"),
+        dict(CAMERA_DATA),
+    ]
+
+    for seconds in (60, 120, 240, 300, 300):
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+        assert coordinator.update_interval == timedelta(seconds=seconds)
+
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.update_interval == UPDATE_INTERVAL
+
+
+async def test_auth_failure_does_not_back_off(hass: HomeAssistant) -> None:
+    """Test an expired token leaves the poll interval unchanged."""
+    coordinator = _create_coordinator(hass)
+    coordinator.ezviz_client.load_cameras.side_effect = EzvizAuthTokenExpired
+
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert coordinator.update_interval == UPDATE_INTERVAL